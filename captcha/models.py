@@ -56,30 +56,55 @@ class CaptchaStore(models.Model):
     remove_expired = classmethod(remove_expired)
 
     @classmethod
-    def generate_key(cls, generator=None):
+    def generate_store(cls, generator=None):
         challenge, response = get_challenge(generator)()
-        store = cls.objects.create(challenge=challenge, response=response)
+        return cls.objects.create(challenge=challenge, response=response)
 
-        return store.hashkey
+    @classmethod
+    def generate_key(cls, generator=None):
+        return cls.generate_store(generator).hashkey
 
     @classmethod
-    def pick(cls):
+    def get_pool_timeout(cls):
+        pool_timeout = float(settings.CAPTCHA_GET_FROM_POOL_TIMEOUT)
+        captcha_timeout = float(settings.CAPTCHA_TIMEOUT)
+        # 配置不合理时取 CAPTCHA_TIMEOUT 的一半，告警在 fill_pool 中输出
+        return pool_timeout if pool_timeout < captcha_timeout else captcha_timeout / 2
+
+    @classmethod
+    def get_pool_minimum_expiration(cls):
+        return timezone.now() + datetime.timedelta(minutes=cls.get_pool_timeout())
+
+    @classmethod
+    def get_pool_queryset(cls):
+        return cls.objects.filter(expiration__gt=cls.get_pool_minimum_expiration())
+
+    @classmethod
+    def claim_from_pool(cls, candidates=10):
+        # 通过条件更新抢占验证码，将其有效期移出池的范围，保证每个验证码只被分配一次
+        minimum_expiration = cls.get_pool_minimum_expiration()
+        stores = list(cls.objects.filter(expiration__gt=minimum_expiration)[:candidates])
+        random.shuffle(stores)
+        for store in stores:
+            if cls.objects.filter(pk=store.pk, expiration__gt=minimum_expiration).update(
+                    expiration=minimum_expiration):
+                store.expiration = minimum_expiration
+                return store
+
+    @classmethod
+    def pick_store(cls):
         if not settings.CAPTCHA_GET_FROM_POOL:
-            return cls.generate_key()
+            return cls.generate_store()
 
-        def fallback():
+        store = cls.claim_from_pool()
+        if not store:
             logger.error("Couldn't get a captcha from pool, generating")
-            return cls.generate_key()
-
-        # Pick up a random item from pool
-        minimum_expiration = timezone.now() + datetime.timedelta(
-            minutes=int(settings.CAPTCHA_GET_FROM_POOL_TIMEOUT)
-        )
-        store = (
-            cls.objects.filter(expiration__gt=minimum_expiration).order_by("?").first()
-        )
+            store = cls.generate_store()
+        return store
 
-        return (store and store.hashkey) or fallback()
+    @classmethod
+    def pick(cls):
+        return cls.pick_store().hashkey
 
     @classmethod
     def create_pool(cls, count=1000):
@@ -87,3 +112,15 @@ class CaptchaStore(models.Model):
         while count > 0:
             cls.generate_key()
             count -= 1
+
+    @classmethod
+    def fill_pool(cls, size=1000):
+        if float(settings.CAPTCHA_GET_FROM_POOL_TIMEOUT) >= float(settings.CAPTCHA_TIMEOUT):
+            logger.warning(f"CAPTCHA_GET_FROM_POOL_TIMEOUT {settings.CAPTCHA_GET_FROM_POOL_TIMEOUT} should be less "
+                           f"than CAPTCHA_TIMEOUT {settings.CAPTCHA_TIMEOUT}, use {cls.get_pool_timeout()}")
+        # 先清理过期数据，并限制总数不超过 2 倍池大小，避免配置错误时无限制地生成数据
+        cls.remove_expired()
+        count = min(size - cls.get_pool_queryset().count(), size * 2 - cls.objects.count())
+        if count > 0:
+            cls.create_pool(count)
+        return max(count, 0)
@@ -5,6 +5,7 @@
 # author : ly_13
 # date : 9/15/2024
 from celery import shared_task
+from django.conf import settings
 
 from captcha.models import CaptchaStore
 from common.celery.decorator import register_as_period_task
@@ -14,3 +15,11 @@ from common.celery.decorator import register_as_period_task
 @register_as_period_task(crontab='12 2 * * *')
 def auto_clean_expired_captcha_job():
     CaptchaStore.remove_expired()
+
+
+@shared_task
+@register_as_period_task(interval=60)
+def auto_fill_captcha_pool_job():
+    if not settings.CAPTCHA_GET_FROM_POOL:
+        return
+    CaptchaStore.fill_pool(settings.CAPTCHA_GET_FROM_POOL_SIZE)
@@ -18,17 +18,11 @@ class CaptchaAuth(object):
     def __init__(self, captcha_key=''):
         self.captcha_key = captcha_key
 
-    def __get_captcha_obj(self):
-        return CaptchaStore.objects.filter(hashkey=self.captcha_key).first()
-
     def generate(self):
-        self.captcha_key = CaptchaStore.generate_key()
+        captcha_obj = CaptchaStore.pick_store()
+        self.captcha_key = captcha_obj.hashkey
         captcha_image = captcha_image_url(self.captcha_key)
-        captcha_obj = self.__get_captcha_obj()
-        code_length = 0
-        if captcha_obj:
-            code_length = len(captcha_obj.response)
-        return {"captcha_image": captcha_image, "captcha_key": self.captcha_key, "length": code_length}
+        return {"captcha_image": captcha_image, "captcha_key": self.captcha_key, "length": len(captcha_obj.response)}
 
     def valid(self, verify_code):
         try:
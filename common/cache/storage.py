@@ -93,6 +93,27 @@ class BlackAccessTokenCache(RedisCacheBase):
         super().__init__(self.cache_key)
 
 
+class WsAuthUserCache(RedisCacheBase):
+    def __init__(self, token_hash):
+        self.cache_key = f"{settings.CACHE_KEY_TEMPLATE.get('ws_auth_user_key')}_{token_hash}"
+        super().__init__(self.cache_key, timeout=60)
+
+
+class WsAuthBreakerCache(RedisCacheBase):
+    def __init__(self, state):
+        self.cache_key = f"{settings.CACHE_KEY_TEMPLATE.get('ws_auth_breaker_key')}_{state}"
+        super().__init__(self.cache_key, timeout=settings.WS_AUTH_BREAKER_RESET_TIMEOUT)
+
+    def pipeline_incr(self):
+        # INCR 和 EXPIRE 在同一个 pipeline 中执行，key 被删除或过期后也能安全计数
+        client = cache.client.get_client(write=True)
+        cache_key = cache.client.make_key(self.cache_key)
+        with client.pipeline() as pipe:
+            pipe.incr(cache_key)
+            pipe.expire(cache_key, self._timeout)
+            return pipe.execute()[0]
+
+
 class UserSystemConfigCache(RedisCacheBase):
     def __init__(self, prefix_key):
         self.cache_key = f"{settings.CACHE_KEY_TEMPLATE.get('config_key')}_{prefix_key}"
@@ -7,6 +7,7 @@
 import functools
 import hashlib
 
+from django.conf import settings
 from django.http.cookie import parse_cookie
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import NotAuthenticated
@@ -17,6 +18,12 @@ from rest_framework_simplejwt.tokens import AccessToken
 from common.cache.storage import BlackAccessTokenCache
 
 
+def get_token_hash(token):
+    if settings.BLACK_ACCESS_TOKEN_HASH == 'md5':
+        return hashlib.md5(token).hexdigest()
+    return hashlib.blake2b(token, digest_size=16).hexdigest()
+
+
 def auth_required(view_func):
     @functools.wraps(view_func)
     def wrapper(view, request, *args, **kwargs):
@@ -34,7 +41,7 @@ class ServerAccessToken(AccessToken):
 
     def verify(self):
         user_id = self.payload.get('user_id')
-        if BlackAccessTokenCache(user_id, hashlib.md5(self.token).hexdigest()).get_storage_cache():
+        if BlackAccessTokenCache(user_id, get_token_hash(self.token)).get_storage_cache():
             raise TokenError(_("Token is invalid or expired"))
         super().verify()
 
@@ -179,7 +179,7 @@ def get_filter_queryset(queryset: QuerySet, user_obj: UserInfo):
     # 获取个人单独授权规则
     permission = DataPermission.objects.filter(is_active=True).filter(userinfo=user_obj).filter(dq)
     # 不存在个人单独授权，则返回部门规则授权
-    if not permission.count():
+    if not permission.exists():
         logger.warning(f"get filter end. {queryset.model._meta.label} : {q}")
         if has_dept:
             return queryset.filter(q)
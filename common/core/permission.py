@@ -37,7 +37,7 @@ def get_user_field_queryset(user_obj, menu):
     q = Q()
     data = {}
     has_q = False
-    if user_obj.roles.count():
+    if user_obj.roles.exists():
         q |= (Q(role__in=user_obj.roles.all()) & Q(role__is_active=True))
         has_q = True
     if user_obj.dept:
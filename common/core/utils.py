@@ -34,6 +34,14 @@ def ignore_white_url(url):
             return True
 
 
+def get_pattern_regex(pattern):
+    # path() 生成的正则以 \Z 结尾，统一替换为 $ ，与 re_path 写法保持一致
+    regex = pattern.regex.pattern.lstrip('^')
+    if regex.endswith('\\Z'):
+        regex = f"{regex[:-2]}$"
+    return regex
+
+
 def recursion_urls(pre_namespace, pre_url, urlpatterns, url_ordered_dict):
     """递归去获取URL
     :param pre_namespace: namespace前缀，以后用户拼接name
@@ -50,7 +58,7 @@ def recursion_urls(pre_namespace, pre_url, urlpatterns, url_ordered_dict):
                 name = "%s:%s" % (pre_namespace, item.name)
             else:
                 name = item.name
-            url = pre_url + item.pattern.regex.pattern.lstrip('^')
+            url = pre_url + get_pattern_regex(item.pattern)
             # url = url.replace('^', '').replace('$', '')
 
             if check_show_url(url) and not ignore_white_url(url):
@@ -63,7 +71,7 @@ def recursion_urls(pre_namespace, pre_url, urlpatterns, url_ordered_dict):
 
 
         elif isinstance(item, URLResolver):  # 路由分发，递归操作
-            new_pre_url = pre_url + item.pattern.regex.pattern.lstrip('^')
+            new_pre_url = pre_url + get_pattern_regex(item.pattern)
             if not check_show_url(new_pre_url):
                 continue
             if pre_namespace:
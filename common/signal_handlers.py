@@ -6,7 +6,7 @@
 # date : 6/29/2023
 import logging
 
-from celery import subtask
+from celery import group, subtask
 from celery.signals import worker_ready, worker_shutdown, after_setup_logger
 from django.core.cache import cache
 from django.db.models.signals import pre_delete
@@ -26,25 +26,26 @@ safe_str = lambda x: x
 
 @worker_ready.connect
 def on_app_ready(sender=None, headers=None, **kwargs):
-    if cache.get("CELERY_APP_READY", 0) == 1:
+    if not cache.add("CELERY_APP_READY", 1, 10):
         return
-    cache.set("CELERY_APP_READY", 1, 10)
     tasks = get_after_app_ready_tasks()
     logger.debug("Work ready signal recv")
     logger.debug("Start need start task: [{}]".format(", ".join(tasks)))
+    disabled_tasks = set(PeriodicTask.objects.filter(task__in=tasks, enabled=False).values_list('task', flat=True))
+    signatures = []
     for task in tasks:
-        periodic_task = PeriodicTask.objects.filter(task=task).first()
-        if periodic_task and not periodic_task.enabled:
+        if task in disabled_tasks:
             logger.debug("Periodic task [{}] is disabled!".format(task))
             continue
-        subtask(task).delay()
+        signatures.append(subtask(task))
+    if signatures:
+        group(signatures).apply_async()
 
 
 @worker_shutdown.connect
 def after_app_shutdown_periodic_tasks(sender=None, **kwargs):
-    if cache.get("CELERY_APP_SHUTDOWN", 0) == 1:
+    if not cache.add("CELERY_APP_SHUTDOWN", 1, 10):
         return
-    cache.set("CELERY_APP_SHUTDOWN", 1, 10)
     tasks = get_after_app_shutdown_clean_tasks()
     logger.debug("Worker shutdown signal recv")
     logger.debug("Clean period tasks: [{}]".format(', '.join(tasks)))
@@ -6,6 +6,7 @@
 # date : 6/27/2023
 import base64
 import json
+from functools import lru_cache
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser
@@ -111,6 +112,16 @@ def get_request_path(request, *args, **kwargs):
     return path
 
 
+@lru_cache(maxsize=4096)
+def parse_user_agent(ua_string):
+    """
+    解析 User-Agent，相同的 UA 字符串直接返回缓存结果，避免重复执行正则匹配
+    :param ua_string:
+    :return:
+    """
+    return parse(ua_string)
+
+
 def get_browser(request):
     """
     获取浏览器名
@@ -118,7 +129,7 @@ def get_browser(request):
     :return:
     """
     ua_string = request.META['HTTP_USER_AGENT']
-    user_agent = parse(ua_string)
+    user_agent = parse_user_agent(ua_string)
     return user_agent.get_browser()
 
 
@@ -129,7 +140,7 @@ def get_os(request):
     :return:
     """
     ua_string = request.META['HTTP_USER_AGENT']
-    user_agent = parse(ua_string)
+    user_agent = parse_user_agent(ua_string)
     return user_agent.get_os()
 
 
@@ -28,10 +28,6 @@ def make_token_cache(key, time_limit=60, prefix='', force_new=False, ext_data=No
         user_ran_str.extend(random_str)
         token = f"tmp_token_{''.join(user_ran_str)}"
 
-        token_cache.set_storage_cache({
-            "atime": time.time() + time_limit,
-            "data": key
-        }, time_limit)
         RedisCacheBase(token).set_storage_cache({
             "atime": time.time() + time_limit,
             "data": key,
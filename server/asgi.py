@@ -7,6 +7,7 @@ For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 import os
+import time
 
 from channels.auth import AuthMiddlewareStack
 from channels.db import database_sync_to_async
@@ -15,6 +16,7 @@ from channels.security.websocket import AllowedHostsOriginValidator
 from django.conf import settings
 from django.core.asgi import get_asgi_application
 from django.core.handlers.asgi import ASGIRequest
+from django.db import DatabaseError
 from django.utils.module_loading import import_string
 
 from common.utils import get_logger
@@ -27,49 +29,166 @@ django_asgi_app = get_asgi_application()
 
 # 写到上面会导致gunicorn启动失败
 from message.routing import urlpatterns as message_urlpatterns
+from rest_framework.authentication import SessionAuthentication
+
+from common.cache.storage import WsAuthUserCache, WsAuthBreakerCache
+from common.core.auth import CookieJWTAuthentication, get_token_hash
+from system.models import UserInfo
 
 urlpatterns = message_urlpatterns
 
 
-@database_sync_to_async
-def get_signature_user(scope):
-    if scope['type'] == 'websocket':
-        scope['method'] = 'GET'
-
-    request = ASGIRequest(scope, None)
+def get_auth_backends():
+    backends = []
     for backend_str in settings.REST_FRAMEWORK.get('DEFAULT_AUTHENTICATION_CLASSES'):
+        backend_cls = import_string(backend_str)
+        # SessionAuthentication 依赖 DRF Request，无法用于 ASGIRequest，session 认证由 AuthMiddlewareStack 兜底
+        if issubclass(backend_cls, SessionAuthentication):
+            continue
+        backends.append((backend_str, backend_cls()))
+    return tuple(backends)
+
+
+_AUTH_BACKENDS = get_auth_backends()
+_JWT_AUTH = CookieJWTAuthentication()
+# 熔断开启时的认证结果，用于直接拒绝握手，不再走 session 认证
+AUTH_BREAKER_OPEN = object()
+
+
+def has_signature(scope):
+    # 所有认证后端均依赖 Authorization 头或 Cookie，没有则无需进入线程池认证
+    for name, _ in scope.get('headers', []):
+        if name in (b'authorization', b'cookie'):
+            return True
+    return False
+
+
+def get_token_hash_by_request(request):
+    # header 格式错误时 get_raw_token 会抛出异常，此时不使用缓存，交给认证后端处理
+    try:
+        header = _JWT_AUTH.get_header(request)
+        raw_token = _JWT_AUTH.get_raw_token(header) if header else None
+        return get_token_hash(raw_token) if raw_token else None
+    except Exception as e:
+        logger.warning(f"web socket get token hash failed. Exception: {e}")
+        return None
+
+
+def get_cache_user(token_hash):
+    # 客户端断线重连时会重复携带同一个 token，缓存 user_id 以跳过 token 校验
+    user_id = WsAuthUserCache(token_hash).get_storage_cache()
+    if user_id:
+        return UserInfo.objects.filter(pk=user_id, is_active=True).first()
+
+
+def set_cache_user(token_hash, user, validated_token):
+    exp = getattr(validated_token, 'payload', {}).get('exp')
+    if not exp:
+        return
+    timeout = min(int(exp - time.time()), 60)  # 不超过 token 剩余有效期
+    if timeout > 0:
+        WsAuthUserCache(token_hash).set_storage_cache(user.pk, timeout)
+
+
+def is_breaker_open():
+    return bool(WsAuthBreakerCache('open').get_storage_cache())
+
+
+def record_breaker_failure():
+    # 多个 ASGI 进程通过 redis 共享熔断状态
+    failed_cache = WsAuthBreakerCache('failed')
+    count = failed_cache.pipeline_incr()
+    if count >= settings.WS_AUTH_BREAKER_FAIL_MAX:
+        WsAuthBreakerCache('open').set_storage_cache(1)
+        failed_cache.del_storage_cache()
+        logger.error(f"web socket auth breaker open. database failed {count} times")
+
+
+def auth_success(request, user):
+    request.user = user
+    # 认证在公共线程池中执行，记录日志后需清理线程变量，避免后续任务复用该线程时读取到本次请求
+    set_current_request(request)
+    try:
+        logger.info(f"web socket auth success")
+    finally:
+        set_current_request(None)
+    return user
+
+
+def authenticate_request(request):
+    if is_breaker_open():
+        logger.warning(f"web socket auth failed. breaker is open")
+        return AUTH_BREAKER_OPEN
+
+    token_hash = get_token_hash_by_request(request)
+    if token_hash:
         try:
-            backend = import_string(backend_str)
-            user, _ = backend().authenticate(request)
-            if user:
-                request.user = user
-                set_current_request(request)
-                logger.info(f"web socket auth success")
-                return user
+            user = get_cache_user(token_hash)
+        except DatabaseError as e:
+            record_breaker_failure()
+            logger.warning(f"web socket auth failed by cache user. Exception: {e}")
+            return None
+        if user:
+            return auth_success(request, user)
+
+    for backend_str, backend in _AUTH_BACKENDS:
+        try:
+            result = backend.authenticate(request)
+        except DatabaseError as e:
+            record_breaker_failure()
+            logger.warning(f"web socket auth failed by {backend_str}. Exception: {e}")
+            return None
         except Exception as e:
             logger.warning(f"web socket auth failed by {backend_str}. Exception: {e}")
+            continue
+        if result and result[0]:
+            user, validated_token = result
+            if token_hash:
+                set_cache_user(token_hash, user, validated_token)
+            return auth_success(request, user)
     logger.error(f"web socket auth failed.")
     return None
 
 
+# 认证不依赖请求线程中的数据库状态，使用 thread_sensitive=False 让多个握手请求可并行认证
+async_authenticate_request = database_sync_to_async(authenticate_request, thread_sensitive=False)
+
+
+async def get_signature_user(scope):
+    if scope['type'] == 'websocket':
+        scope['method'] = 'GET'
+
+    if not has_signature(scope):
+        logger.error(f"web socket auth failed. signature not found")
+        return None
+
+    request = ASGIRequest(scope, None)
+    return await async_authenticate_request(request)
+
+
 class WsSignatureAuthMiddleware:
     def __init__(self, app):
         self.app = app
+        # 自定义认证失败时，才使用 channels 的 session 认证
+        self.fallback = AuthMiddlewareStack(app)
 
     async def __call__(self, scope, receive, send):
         user = await get_signature_user(scope)
+        if user is AUTH_BREAKER_OPEN:
+            # 拒绝握手，1013 表示服务暂时不可用，请稍后重试
+            await receive()
+            return await send({"type": "websocket.close", "code": 1013})
         if user:
             scope['user'] = user
-        return await self.app(scope, receive, send)
+            return await self.app(scope, receive, send)
+        return await self.fallback(scope, receive, send)
 
 
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
         "websocket": AllowedHostsOriginValidator(
-            WsSignatureAuthMiddleware(
-                AuthMiddlewareStack(URLRouter(urlpatterns))
-            )
+            WsSignatureAuthMiddleware(URLRouter(urlpatterns))
         ),
     }
 )
@@ -196,6 +196,10 @@ CHANNEL_LAYERS = {
     },
 }
 
+# websocket 认证熔断，在 RESET_TIMEOUT 秒内数据库异常次数达到 FAIL_MAX 后，RESET_TIMEOUT 秒内直接拒绝认证，防止重连风暴压垮数据库
+WS_AUTH_BREAKER_FAIL_MAX = locals().get('WS_AUTH_BREAKER_FAIL_MAX', 20)
+WS_AUTH_BREAKER_RESET_TIMEOUT = locals().get('WS_AUTH_BREAKER_RESET_TIMEOUT', 5)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -386,10 +390,17 @@ CACHE_KEY_TEMPLATE = {
     'user_websocket_key': 'user_websocket',
     'upload_part_info_key': 'upload_part_info',
     'black_access_token_key': 'black_access_token',
+    'ws_auth_user_key': 'ws_auth_user',
+    'ws_auth_breaker_key': 'ws_auth_breaker',
     'common_resource_ids_key': 'common_resource_ids',
     **locals().get('CACHE_KEY_TEMPLATE', {})
 }
 
+# access token 黑名单缓存key的摘要算法，可选 md5, blake2b
+# 默认 md5 与旧版本一致；切换为 blake2b 前，需等待已登出的 access token 全部过期(ACCESS_TOKEN_LIFETIME)，
+# 否则切换前已登出的 access token 在过期前会重新生效
+BLACK_ACCESS_TOKEN_HASH = locals().get('BLACK_ACCESS_TOKEN_HASH', 'md5')
+
 # Celery Configuration Options
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html?
 CELERY_TIMEZONE = "Asia/Shanghai"
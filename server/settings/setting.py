@@ -128,6 +128,10 @@ CAPTCHA_PUNCTUATION = """_"',.;:-"""
 CAPTCHA_FLITE_PATH = None
 CAPTCHA_SOX_PATH = None
 CAPTCHA_MATH_CHALLENGE_OPERATOR = "*"
+# 开启后由定时任务预先生成验证码，剩余有效期大于 CAPTCHA_GET_FROM_POOL_TIMEOUT(minutes) 的验证码才会被使用
+# 每个验证码只分配一次，分配后的有效期为 CAPTCHA_GET_FROM_POOL_TIMEOUT(minutes)
+# CAPTCHA_GET_FROM_POOL_TIMEOUT 需小于 CAPTCHA_TIMEOUT，否则取 CAPTCHA_TIMEOUT 的一半
 CAPTCHA_GET_FROM_POOL = False
-CAPTCHA_GET_FROM_POOL_TIMEOUT = 5
+CAPTCHA_GET_FROM_POOL_TIMEOUT = 2
+CAPTCHA_GET_FROM_POOL_SIZE = 1000
 CAPTCHA_2X_IMAGE = True
@@ -56,6 +56,34 @@ class BlockUtilBase:
             cache.set(self.block_key, True, self.key_ttl)
         return limit_count - count
 
+    def pipeline_incr_failed_count(self, ip_block=None) -> int:
+        """
+        累加账户失败次数，同时累加 ip 失败次数，通过 redis pipeline 一次往返完成
+        :param ip_block: BlockGlobalIpUtilBase 对象
+        :return: 剩余尝试次数
+        """
+        client = cache.client.get_client(write=True)
+        limit_key = cache.client.make_key(self.limit_key)
+        ip_limit_key = None
+        if ip_block and not (ip_block.ip_in_white_list or ip_block.ip_in_black_list):
+            ip_limit_key = cache.client.make_key(ip_block.limit_key)
+
+        with client.pipeline() as pipe:
+            pipe.incr(limit_key)
+            pipe.expire(limit_key, self.key_ttl)
+            if ip_limit_key:
+                pipe.incr(ip_limit_key)
+                pipe.expire(ip_limit_key, ip_block.key_ttl)
+            result = pipe.execute()
+
+        count = result[0]
+        limit_count = settings.SECURITY_LOGIN_LIMIT_COUNT
+        if count >= limit_count:
+            cache.set(self.block_key, True, self.key_ttl)
+        if ip_limit_key and result[2] >= settings.SECURITY_LOGIN_IP_LIMIT_COUNT:
+            cache.set(ip_block.block_key, timezone.now().isoformat(), ip_block.key_ttl)
+        return int(limit_count) - count
+
     def get_failed_count(self):
         count = cache.get(self.limit_key, 0)
         return count
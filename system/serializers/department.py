@@ -58,4 +58,7 @@ class DeptSerializer(BaseModelSerializer):
 
     @extend_schema_field(serializers.IntegerField)
     def get_user_count(self, obj):
-        return obj.userinfo_set.count()
+        user_count = getattr(obj, 'user_count', None)  # 优先使用 queryset 中 annotate 的统计结果
+        if user_count is None:
+            user_count = obj.userinfo_set.count()
+        return user_count
@@ -11,8 +11,9 @@ from django.dispatch import receiver
 
 from common.base.magic import cache_response, MagicCacheData
 from common.core.config import SysConfig
+from common.decorators import on_transaction_commit
 from common.utils import get_logger
-from system.models import Menu, UserRole, UserInfo, DeptInfo, DataPermission, SystemConfig
+from system.models import Menu, MenuMeta, UserRole, UserInfo, DeptInfo, DataPermission, SystemConfig
 from system.signal import invalid_user_cache_signal
 
 logger = get_logger(__name__)
@@ -30,6 +31,16 @@ def invalid_route_view_cache(user_pk):
     cache_response.invalid_cache(f'UserRoutesAPIView_get_{user_pk}')
 
 
+@on_transaction_commit
+def invalid_search_dept_view_cache(user_pk='*'):
+    cache_response.invalid_cache(f'SearchDeptViewSet_list_{user_pk}_*')
+
+
+@on_transaction_commit
+def invalid_search_menu_view_cache(user_pk='*'):
+    cache_response.invalid_cache(f'SearchMenuViewSet_list_{user_pk}_*')
+
+
 def invalid_user_permission_data_cache(user_pk):
     MagicCacheData.invalid_cache(f'get_user_permission_{user_pk}_*')  # 清理权限
 
@@ -45,6 +56,8 @@ def invalid_user_cache(**kwargs):
     # invalid_userinfo_view_cache(user_pk)
     invalid_route_view_cache(user_pk)
     invalid_menu_view_cache(f'{user_pk}_*')
+    invalid_search_dept_view_cache(user_pk)
+    invalid_search_menu_view_cache(user_pk)
 
     invalid_user_permission_data_cache(user_pk)
     MagicCacheData.invalid_cache(f'get_user_field_queryset_{user_pk}')  # 清理权限
@@ -59,7 +72,7 @@ def clean_m2m_cache_handler(sender, instance, **kwargs):
 
         if isinstance(instance, DeptInfo):  # 分配用户角色，需要同时清理用户路由和用户信息
             for dept in DeptInfo.objects.filter(pk__in=DeptInfo.recursion_dept_info(instance.pk)).all():
-                if dept.userinfo_set.count():
+                if dept.userinfo_set.exists():
                     invalid_roles_cache(instance)
 
         if isinstance(instance, UserRole):
@@ -69,7 +82,7 @@ def clean_m2m_cache_handler(sender, instance, **kwargs):
 
 def invalid_dept_caches(instance):
     for dept in instance.deptinfo_set.all().distinct():
-        if dept.userinfo_set.count():
+        if dept.userinfo_set.exists():
             invalid_roles_cache(dept)
 
 
@@ -107,10 +120,29 @@ def clean_cache_handler(sender, instance, **kwargs):
         SysConfig.invalid_config_cache(instance.key)
 
 
+@receiver([post_save, pre_delete], sender=UserInfo)
+def clean_search_dept_user_cache_handler(sender, instance, signal, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if signal is pre_delete or update_fields is None or 'dept' in update_fields:
+        invalid_search_dept_view_cache()  # 部门用户数量发生变化
+
+
+@receiver([post_save, pre_delete], sender=DeptInfo)
+def clean_search_dept_cache_handler(sender, instance, **kwargs):
+    invalid_search_dept_view_cache()
+    logger.info(f"invalid cache {sender}")
+
+
+@receiver([post_save, pre_delete], sender=MenuMeta)
+def clean_search_menu_cache_handler(sender, instance, **kwargs):
+    invalid_search_menu_view_cache()
+    logger.info(f"invalid cache {sender}")
+
+
 @receiver([pre_delete])
 def clean_cache_handler_pre_delete(sender, instance, **kwargs):
     if issubclass(sender, DeptInfo):
-        if instance.userinfo_set.count():
+        if instance.userinfo_set.exists():
             invalid_roles_cache(instance)
             logger.info(f"invalid cache {sender}")
 
@@ -118,6 +150,7 @@ def clean_cache_handler_pre_delete(sender, instance, **kwargs):
 @receiver([post_save, pre_delete], sender=Menu)
 def clean_cache_handler(sender, instance, **kwargs):
     invalid_menu_view_cache('*')
+    invalid_search_menu_view_cache()
     invalid_superuser_cache()
     invalid_route_view_cache('*')
     invalid_user_permission_data_cache('*')
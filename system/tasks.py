@@ -6,9 +6,14 @@
 # date : 6/29/2023
 
 from celery import shared_task
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from common.celery.decorator import register_as_period_task
 from common.utils import get_logger
+from common.utils.request import parse_user_agent
+from settings.utils.security import LoginBlockUtil, LoginIpBlockUtil
+from system.models import UserInfo
+from system.serializers.log import LoginLogSerializer
 from system.utils.ctasks import auto_clean_operation_log, auto_clean_black_token, auto_clean_tmp_file
 
 logger = get_logger(__name__)
@@ -30,3 +35,40 @@ def auto_clean_black_token_job():
 @register_as_period_task(crontab='32 2 * * *')
 def auto_clean_tmp_file_job():
     auto_clean_tmp_file(clean_day=7)
+
+
+@shared_task(ignore_result=True)
+def record_login_log(user_id, data):
+    user = UserInfo.objects.filter(pk=user_id).first() if user_id else None
+    user_agent = parse_user_agent(data.pop('user_agent', ''))
+    data.update({
+        'browser': user_agent.get_browser(),
+        'system': user_agent.get_os(),
+        'agent': str(user_agent),
+    })
+    serializer = LoginLogSerializer(data=data, ignore_field_permission=True)
+    serializer.is_valid(raise_exception=True)
+    if user:
+        serializer.save(creator=user, dept_belong=user.dept)
+    else:
+        serializer.save()
+
+
+@shared_task(ignore_result=True)
+def blacklist_refresh_token(refresh):
+    try:
+        RefreshToken(refresh).blacklist()  # 将账户的 refresh token 加入黑名单
+    except Exception as e:
+        logger.warning(f"blacklist refresh token failed. Exception: {e}")
+
+
+@shared_task(ignore_result=True)
+def finalize_login(user_id, username, ipaddr, data):
+    from system.utils.auth import check_different_city_login_if_need  # system.utils.auth 依赖本模块，避免循环导入
+
+    LoginBlockUtil(username, ipaddr).clean_failed_count()
+    LoginIpBlockUtil(ipaddr).clean_block_if_need()
+    user = UserInfo.objects.filter(pk=user_id).first()
+    if user:
+        check_different_city_login_if_need(user, ipaddr)  # 需在写入本次登录日志之前检查
+    record_login_log(user_id, data)
@@ -4,7 +4,7 @@
 # filename : urls
 # author : ly_13
 # date : 6/6/2023
-from django.urls import re_path, include
+from django.urls import path, include
 from rest_framework.routers import SimpleRouter
 
 from common.core.routers import NoDetailRouter
@@ -41,25 +41,25 @@ router = SimpleRouter(False)
 no_detail_router = NoDetailRouter(False)
 
 no_auth_url = [
-    re_path('^captcha/', include('captcha.urls')),
-    re_path('^login/basic$', BasicLoginAPIView.as_view(), name='login-by-basic'),
-    re_path('^login/code$', VerifyCodeLoginAPIView.as_view(), name='login-by-code'),
-    re_path('^register$', RegisterViewAPIView.as_view(), name='register'),
-    re_path('^auth/captcha$', CaptchaAPIView.as_view(), name='captcha'),
-    re_path('^auth/token$', TempTokenAPIView.as_view(), name='temp_token'),
-    re_path('^auth/verify$', SendVerifyCodeAPIView.as_view(), name='send-verify-code'),
-    re_path('^auth/reset$', ResetPasswordAPIView.as_view(), name='reset-password'),
+    path('captcha/', include('captcha.urls')),
+    path('login/basic', BasicLoginAPIView.as_view(), name='login-by-basic'),
+    path('login/code', VerifyCodeLoginAPIView.as_view(), name='login-by-code'),
+    path('register', RegisterViewAPIView.as_view(), name='register'),
+    path('auth/captcha', CaptchaAPIView.as_view(), name='captcha'),
+    path('auth/token', TempTokenAPIView.as_view(), name='temp_token'),
+    path('auth/verify', SendVerifyCodeAPIView.as_view(), name='send-verify-code'),
+    path('auth/reset', ResetPasswordAPIView.as_view(), name='reset-password'),
 
 ]
 
 auth_url = [
-    re_path('^logout$', LogoutAPIView.as_view(), name='logout'),
-    re_path('^refresh$', RefreshTokenAPIView.as_view(), name='refresh'),
-    re_path('^rules/password$', PasswordRulesAPIView.as_view(), name='password-rules'),
+    path('logout', LogoutAPIView.as_view(), name='logout'),
+    path('refresh', RefreshTokenAPIView.as_view(), name='refresh'),
+    path('rules/password', PasswordRulesAPIView.as_view(), name='password-rules'),
 ]
 
 router_url = [
-    re_path('^routes$', UserRoutesAPIView.as_view(), name='user_routes'),
+    path('routes', UserRoutesAPIView.as_view(), name='user_routes'),
 ]
 # 面板信息
 router.register('dashboard', DashboardViewSet, basename='dashboard')
@@ -7,23 +7,23 @@
 import ipaddress
 
 from django.conf import settings
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import APIException
-from user_agents import parse
 
 from captcha.utils import CaptchaAuth
 from common.base.utils import AESCipherV2
 from common.utils.ip import get_ip_city
-from common.utils.request import get_request_ip, get_browser, get_os, get_request_ident
+from common.utils.request import get_request_ip, get_request_ident
 from common.utils.token import verify_token_cache
 from common.utils.verify_code import TokenTempCache, SendAndVerifyCodeUtil
 from settings.utils.security import LoginIpBlockUtil, LoginBlockUtil
 from system.models import UserLoginLog, UserInfo
 from system.notifications import DifferentCityLoginMessage
-from system.serializers.log import LoginLogSerializer
+from system.tasks import record_login_log
 
 
-def get_token_lifetime(user_obj):
+def get_token_lifetime(user_obj=None):
     access_token_lifetime = settings.SIMPLE_JWT.get('ACCESS_TOKEN_LIFETIME')
     refresh_token_lifetime = settings.SIMPLE_JWT.get('REFRESH_TOKEN_LIFETIME')
     return {
@@ -76,22 +76,25 @@ def check_is_block(username, ipaddr, ip_block=LoginIpBlockUtil, login_block=Logi
                              " again after {} minutes)").format(settings.SECURITY_LOGIN_LIMIT_TIME))
 
 
-def save_login_log(request, login_type=UserLoginLog.LoginTypeChoices.USERNAME, status=True):
+def get_login_log_data(request, login_type=UserLoginLog.LoginTypeChoices.USERNAME, status=True):
     login_ip = get_request_ip(request) if request else ''
     login_ip = login_ip or '0.0.0.0'
     login_city = get_ip_city(login_ip) or _("Unknown")
-    data = {
+    return {
         'ipaddress': login_ip,
         'city': str(login_city),
-        'browser': get_browser(request),
-        'system': get_os(request),
         'status': status,
-        'agent': str(parse(request.META['HTTP_USER_AGENT'])),
-        'login_type': login_type
+        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+        'login_type': int(login_type)
     }
-    serializer = LoginLogSerializer(data=data, request=request, ignore_field_permission=True)
-    serializer.is_valid(raise_exception=True)
-    serializer.save()
+
+
+def save_login_log(request, login_type=UserLoginLog.LoginTypeChoices.USERNAME, status=True):
+    user = getattr(request, 'user', None)
+    user_id = user.pk if user and user.is_authenticated else None
+    data = get_login_log_data(request, login_type, status)
+    # 登录日志写入和 UA 解析放到 celery 中执行，事务提交后再投递
+    transaction.on_commit(lambda: record_login_log.delay(user_id, data))
 
 
 def verify_sms_email_code(request, block_utils):
@@ -116,11 +119,9 @@ def verify_sms_email_code(request, block_utils):
     try:
         SendAndVerifyCodeUtil(target).verify(verify_code)
     except Exception as e:
-        block_util.incr_failed_count()
-        ip_block.set_block_if_need()
+        times_remainder = block_util.pipeline_incr_failed_count(ip_block)
         request.user = UserInfo.objects.filter(**{query_key: target}).first()
         save_login_log(request, login_type=UserLoginLog.get_login_type(query_key), status=False)
-        times_remainder = block_util.get_remainder_times()
         if times_remainder > 0:
             detail = _(
                 "{error} please enter it again. "
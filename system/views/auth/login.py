@@ -7,6 +7,7 @@
 
 from django.conf import settings
 from django.contrib.auth import authenticate
+from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.plumbing import build_object_type, build_basic_type
@@ -23,8 +24,9 @@ from common.swagger.utils import get_default_response_schema
 from common.utils.request import get_request_ip
 from settings.utils.security import LoginBlockUtil, LoginIpBlockUtil
 from system.models import UserInfo, UserLoginLog
+from system.tasks import finalize_login
 from system.utils.auth import get_username_password, get_token_lifetime, check_is_block, check_token_and_captcha, \
-    save_login_log, verify_sms_email_code, check_different_city_login_if_need
+    save_login_log, verify_sms_email_code, get_login_log_data
 
 
 def login_failed(request, username):
@@ -33,10 +35,7 @@ def login_failed(request, username):
     login_ip_block = LoginIpBlockUtil(ipaddr)
     request.user = UserInfo.objects.filter(username=username).first()
     save_login_log(request, status=False)
-    login_block_util.incr_failed_count()
-    login_ip_block.set_block_if_need()
-
-    times_remainder = login_block_util.get_remainder_times()
+    times_remainder = login_block_util.pipeline_incr_failed_count(login_ip_block)
     if times_remainder > 0:
         detail = _(
             "The username or password you entered is incorrect, "
@@ -52,13 +51,10 @@ def login_failed(request, username):
 
 def login_success(request, user_obj, login_type=UserLoginLog.LoginTypeChoices.USERNAME):
     ipaddr = get_request_ip(request)
-    login_block_util = LoginBlockUtil(user_obj.username, ipaddr)
-    login_ip_block = LoginIpBlockUtil(ipaddr)
-    login_block_util.clean_failed_count()
-    login_ip_block.clean_block_if_need()
     request.user = user_obj
-    check_different_city_login_if_need(user_obj, ipaddr)
-    save_login_log(request, login_type=login_type)
+    data = get_login_log_data(request, login_type=login_type)
+    # 清理失败次数，异地登录检查，写入登录日志，统一交给 celery 执行
+    transaction.on_commit(lambda: finalize_login.delay(user_obj.pk, user_obj.username, ipaddr, data))
 
 
 class BasicLoginAPIView(TokenObtainPairView):
@@ -4,7 +4,6 @@
 # filename : logout
 # author : ly_13
 # date : 8/8/2024
-import hashlib
 import time
 
 from django.contrib.auth import logout
@@ -12,11 +11,12 @@ from drf_spectacular.plumbing import build_object_type, build_basic_type
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiRequest
 from rest_framework.generics import GenericAPIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from common.cache.storage import BlackAccessTokenCache
+from common.cache.storage import BlackAccessTokenCache, WsAuthUserCache
+from common.core.auth import get_token_hash
 from common.core.response import ApiResponse
 from common.swagger.utils import get_default_response_schema
+from system.tasks import blacklist_refresh_token
 
 
 class LogoutAPIView(GenericAPIView):
@@ -34,12 +34,12 @@ class LogoutAPIView(GenericAPIView):
         exp = auth.payload.get('exp')
         user_id = auth.payload.get('user_id')
         timeout = exp - time.time()
-        BlackAccessTokenCache(user_id, hashlib.md5(auth.token).hexdigest()).set_storage_cache(1, timeout)
-        if request.data.get('refresh'):
-            try:
-                token = RefreshToken(request.data.get('refresh'))
-                token.blacklist()  # 登出账户，并且将账户的access 和 refresh token 加入黑名单
-            except Exception as e:
-                pass
+        # access token 黑名单需立即生效，同步写入缓存；refresh token 黑名单需写库，交给 celery 异步处理
+        token_hash = get_token_hash(auth.token)
+        BlackAccessTokenCache(user_id, token_hash).set_storage_cache(1, timeout)
+        WsAuthUserCache(token_hash).del_storage_cache()
+        refresh = request.data.get('refresh')
+        if refresh:
+            blacklist_refresh_token.delay(refresh)
         logout(request)
         return ApiResponse()
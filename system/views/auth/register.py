@@ -7,6 +7,7 @@
 
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.plumbing import build_object_type, build_basic_type
@@ -82,27 +83,30 @@ class RegisterViewAPIView(GenericAPIView):
         with cache.lock(f"_LOCKER_REGISTER_USER", timeout=10):  # 加锁是为了防止并发注册导致手机，邮箱或者用户名重复
             if UserInfo.objects.filter(**{query_key: target}).exists():
                 return ApiResponse(code=1002, detail=_("The account already exists, please try another one"))
-            user = UserInfo.objects.create_user(username=username, password=password, nickname=username, **default)
+            with transaction.atomic():
+                user = UserInfo.objects.create_user(username=username, password=password, nickname=username,
+                                                    **default)
 
-        update_fields = ['last_login']
+                update_fields = ['last_login']
 
-        if channel and user:
-            dept = DeptInfo.objects.filter(is_active=True, auto_bind=True, code=channel).first()
-            if not dept:
-                dept = DeptInfo.objects.filter(is_active=True, auto_bind=True).first()
-            if dept:
-                user.dept = dept
-                user.dept_belong = dept
-                update_fields.extend(['dept_belong', 'dept'])
+                if channel and user:
+                    dept = DeptInfo.objects.filter(is_active=True, auto_bind=True, code=channel).first()
+                    if not dept:
+                        dept = DeptInfo.objects.filter(is_active=True, auto_bind=True).first()
+                    if dept:
+                        user.dept = dept
+                        user.dept_belong = dept
+                        update_fields.extend(['dept_belong', 'dept'])
+
+                user.last_login = timezone.now()
+                user.save(update_fields=update_fields)
+                request.user = user
+                save_login_log(request)
 
         refresh = RefreshToken.for_user(user)
         result = {
             'refresh': str(refresh),
             'access': str(refresh.access_token),
         }
-        user.last_login = timezone.now()
-        user.save(update_fields=update_fields)
         result.update(**get_token_lifetime(user))
-        request.user = user
-        save_login_log(request)
         return ApiResponse(data=result)
@@ -26,7 +26,7 @@ class TempTokenAPIView(GenericAPIView):
     @extend_schema(responses=get_default_response_schema({'token': build_basic_type(OpenApiTypes.STR)}))
     def get(self, request):
         """获取{cls}"""
-        token = make_token_cache(get_request_ident(request), time_limit=600, force_new=True).encode('utf-8')
+        token = make_token_cache(get_request_ident(request), time_limit=600, force_new=True)
         return ApiResponse(token=token)
 
 
@@ -54,5 +54,5 @@ class RefreshTokenAPIView(TokenRefreshView):
 
     def post(self, request, *args, **kwargs):
         data = super().post(request, *args, **kwargs).data
-        data.update(get_token_lifetime(request.user))
+        data.update(get_token_lifetime())  # 有效期只与配置有关，无需访问 request.user 触发认证
         return ApiResponse(data=data)
@@ -5,10 +5,12 @@
 # author : ly_13
 # date : 7/22/2024
 
+from django.db.models import Count
 from django_filters import rest_framework as filters
 
+from common.base.magic import cache_response
 from common.core.filter import BaseFilterSet
-from common.core.modelset import OnlyListModelSet
+from common.core.modelset import OnlyListModelSet, CacheListResponseMixin
 from common.core.pagination import DynamicPageNumber
 from common.utils import get_logger
 from system.models import DeptInfo
@@ -34,10 +36,15 @@ class SearchDeptSerializer(DeptSerializer):
         read_only_fields = [x.name for x in DeptInfo._meta.fields]
 
 
-class SearchDeptViewSet(OnlyListModelSet):
+class SearchDeptViewSet(OnlyListModelSet, CacheListResponseMixin):
     """部门搜索"""
-    queryset = DeptInfo.objects.all()
+    queryset = DeptInfo.objects.select_related('parent').annotate(user_count=Count('dept_query', distinct=True)).all()
     serializer_class = SearchDeptSerializer
     pagination_class = DynamicPageNumber(1000)
     ordering_fields = ['created_time', 'rank']
     filterset_class = SearchDeptFilter
+
+    @cache_response(timeout=3600, key_func='get_cache_key')
+    def list(self, request, *args, **kwargs):
+        """获取{cls}的列表"""
+        return super().list(request, *args, **kwargs)
@@ -9,8 +9,9 @@ from django.utils.translation import gettext_lazy as _
 from django_filters import rest_framework as filters
 from rest_framework import serializers
 
+from common.base.magic import cache_response
 from common.core.filter import BaseFilterSet
-from common.core.modelset import OnlyListModelSet
+from common.core.modelset import OnlyListModelSet, CacheListResponseMixin
 from common.core.pagination import DynamicPageNumber
 from system.models import Menu
 from system.serializers.menu import MenuSerializer
@@ -36,10 +37,15 @@ class SearchMenuSerializer(MenuSerializer):
     title = serializers.CharField(source='meta.title', read_only=True, label=_("Menu title"))
 
 
-class SearchMenuViewSet(OnlyListModelSet):
+class SearchMenuViewSet(OnlyListModelSet, CacheListResponseMixin):
     """菜单搜索"""
-    queryset = Menu.objects.order_by('rank').all()
+    queryset = Menu.objects.select_related('parent', 'meta').order_by('rank').all()
     serializer_class = SearchMenuSerializer
     pagination_class = DynamicPageNumber(1000)
     ordering_fields = ['-rank', 'updated_time', 'created_time']
     filterset_class = SearchMenuFilter
+
+    @cache_response(timeout=3600, key_func='get_cache_key')
+    def list(self, request, *args, **kwargs):
+        """获取{cls}的列表"""
+        return super().list(request, *args, **kwargs)
@@ -37,7 +37,7 @@ class SearchUserSerializer(UserSerializer):
 
 class SearchUserViewSet(OnlyListModelSet):
     """用户搜索"""
-    queryset = UserInfo.objects.all()
+    queryset = UserInfo.objects.select_related('dept').all()
     serializer_class = SearchUserSerializer
 
     ordering_fields = ['date_joined', 'last_login', 'created_time']